@@ -2,14 +2,27 @@
 from __future__ import annotations
 
 import argparse
+import logging
+import shutil
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from lib import utils
 
-from lib import feeds, notes, now_playing, status, utils, weather
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+TEMPLATE_NAMES = (
+    "index.html",
+    "404.html",
+    "notes_index.html",
+    "note_detail.html",
+    "links_index.html",
+    "now_index.html",
+    "about_index.html",
+)
 
 
 def parse_args() -> argparse.Namespace:
@@ -19,99 +32,110 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--content-dir", default="", help="Content directory")
     parser.add_argument("--templates-dir", default="", help="Templates directory")
     parser.add_argument("--static-dir", default="", help="Static assets directory")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep the output directory and skip notes whose page is newer than its source",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print data-source diagnostics")
     return parser.parse_args()
 
 
+@dataclass(frozen=True)
+class Paths:
+    content_dir: Path
+    templates_dir: Path
+    static_dir: Path
+    output_dir: Path
+    cache_dir: Path
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> Paths:
+        project_root = Path(__file__).resolve().parents[1]
+
+        def resolve(raw: str, default_name: str) -> Path:
+            return Path(raw) if raw else project_root / default_name
+
+        return cls(
+            content_dir=resolve(args.content_dir, "content"),
+            templates_dir=resolve(args.templates_dir, "templates"),
+            static_dir=resolve(args.static_dir, "static"),
+            output_dir=resolve(args.output_dir, "dist"),
+            cache_dir=resolve(args.cache_dir, "cache"),
+        )
+
+
 def render_template(
-    env: Environment,
-    template_name: str,
+    template: Template,
     destination: Path,
     context: dict[str, Any],
 ) -> None:
-    utils.ensure_dir(destination.parent)
-    html = env.get_template(template_name).render(**context)
-    destination.write_text(html, encoding="utf-8")
+    html = template.render(**context)
+    utils.write_if_changed(destination, html.encode("utf-8"))
+
 
+def _prune_stale_note_pages(notes_output_dir: Path, slugs: set[str], total_pages: int) -> None:
+    if not notes_output_dir.is_dir():
+        return
 
-def _to_positive_int(raw_value: Any, default: int) -> int:
-    try:
-        value = int(raw_value)
-    except (TypeError, ValueError):
-        return default
-    if value <= 0:
-        return default
-    return value
+    for child in notes_output_dir.iterdir():
+        if not child.is_dir():
+            continue
+        if child.name == "page":
+            for page_dir in child.iterdir():
+                if not (page_dir.name.isdigit() and 2 <= int(page_dir.name) <= total_pages):
+                    shutil.rmtree(page_dir)
+            continue
+        if child.name not in slugs:
+            shutil.rmtree(child)
 
 
 def main() -> None:
     args = parse_args()
+    paths = Paths.from_args(args)
+    logging.basicConfig(level=logging.WARNING, format="[%(name)s] %(message)s")
+    if args.verbose:
+        logging.getLogger("now-playing").setLevel(logging.DEBUG)
+
+    # Heavy dependencies are imported only once arguments are valid, keeping --help instant.
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+    from lib import feeds, notes, now_playing, status, weather
+    from lib.config import load_build_config
+
+    utils.ensure_dir(paths.cache_dir)
+    if args.incremental:
+        utils.ensure_dir(paths.output_dir)
+        # Every page embeds templates, config and asset cache-busters, so any change there
+        # invalidates all previously rendered notes.
+        inputs_mtime = utils.latest_mtime(
+            [
+                paths.templates_dir,
+                paths.static_dir,
+                paths.content_dir / "config.yaml",
+                paths.content_dir / "webring.yaml",
+            ]
+        )
+    else:
+        utils.clean_output_dir(paths.output_dir)
+        inputs_mtime = 0.0
 
-    project_root = Path(__file__).resolve().parents[1]
-    content_dir = Path(args.content_dir) if args.content_dir else project_root / "content"
-    templates_dir = Path(args.templates_dir) if args.templates_dir else project_root / "templates"
-    static_dir = Path(args.static_dir) if args.static_dir else project_root / "static"
-    output_dir = Path(args.output_dir) if args.output_dir else project_root / "dist"
-    cache_dir = Path(args.cache_dir) if args.cache_dir else project_root / "cache"
-
-    utils.ensure_dir(cache_dir)
-    utils.clean_output_dir(output_dir)
-
-    config = utils.load_yaml(content_dir / "config.yaml", default={})
-    site = config.get("site", {})
-    about = config.get("about", {})
-    status_bar = config.get("status_bar", {})
-    footer = config.get("footer", {})
-    now_playing_settings = config.get("now_playing", {})
-    home_settings = config.get("home", {})
-    notes_settings = config.get("notes", {})
-    tiny_lines = utils.load_lines(content_dir / "tiny.txt")
-
-    if not isinstance(site, dict):
-        site = {}
-    if not isinstance(status_bar, dict):
-        status_bar = {}
-    if not isinstance(footer, dict):
-        footer = {}
-    if not isinstance(now_playing_settings, dict):
-        now_playing_settings = {}
-    if not isinstance(home_settings, dict):
-        home_settings = {}
-    if not isinstance(notes_settings, dict):
-        notes_settings = {}
-
-    site_power = str(site.get("power", "")).strip()
-    if not site_power:
-        site_power = str(status_bar.get("power_label", "grid")).strip() or "grid"
-    site = {**site, "power": site_power}
-
-    status_bar = {
-        "power_label": site_power,
-    }
-    footer_links = footer.get("links", [])
-    if not isinstance(footer_links, list):
-        footer_links = []
-
-    normalized_footer_links: list[dict[str, str]] = []
-    for item in footer_links:
-        if not isinstance(item, dict):
-            continue
-        label = str(item.get("label", "")).strip()
-        href = str(item.get("href", "")).strip()
-        if label and href:
-            normalized_footer_links.append({"label": label, "href": href})
-    footer = {"links": normalized_footer_links}
+    build_config = load_build_config(paths.content_dir / "config.yaml")
+    config = build_config.raw
+    site = build_config.site
+    tiny_lines = utils.load_lines(paths.content_dir / "tiny.txt")
 
-    all_notes = notes.load_notes(content_dir / "notes", site_domain=str(site.get("domain", "")))
+    all_notes = notes.load_notes(paths.content_dir / "notes", site_domain=str(site.get("domain", "")))
     all_links, links_source = feeds.fetch_links(
-        content_path=content_dir / "feeds.yaml",
-        cache_dir=cache_dir,
-        ttl_minutes=int(config.get("feeds_ttl_minutes", 30)),
+        content_path=paths.content_dir / "feeds.yaml",
+        cache_dir=paths.cache_dir,
+        ttl_minutes=build_config.feeds_ttl_minutes,
         limit=120,
     )
     links_preview = feeds.select_preview_links(all_links, limit=6)
-    weather_data, weather_source = weather.fetch_weather(config, cache_dir)
-    status_bundle, _ = status.fetch_status(config, cache_dir)
-    now_data, now_history, now_source = now_playing.fetch_now(config, cache_dir, content_dir)
+    weather_data, weather_source = weather.fetch_weather(config, paths.cache_dir)
+    status_bundle, _ = status.fetch_status(config, paths.cache_dir)
+    now_data, now_history, now_source = now_playing.fetch_now(config, paths.cache_dir, paths.content_dir)
 
     built_at = datetime.now().astimezone()
     build_id = built_at.strftime("%Y%m%d%H%M%S")
@@ -119,42 +143,28 @@ def main() -> None:
         "updated_iso": built_at.isoformat(),
         "updated_label": utils.format_datetime(built_at),
     }
-    now_source_url = str(now_playing_settings.get("source_url", "")).strip()
-    now_stream_url = str(now_playing_settings.get("stream_url", "")).strip() or "https://www.blurfm.com/"
-    now_player_stream_url = (
-        str(now_playing_settings.get("player_stream_url", "")).strip() or "https://stream.blurfm.com/high"
-    )
-    now_api_url = now_source_url
-    parsed_now_url = urlparse(now_source_url)
-    if parsed_now_url.scheme and parsed_now_url.netloc:
-        host = parsed_now_url.netloc.lower()
-        if host in {"nico.com.ar", "www.nico.com.ar"}:
-            now_api_url = parsed_now_url.path or "/api/now-playing"
-            if parsed_now_url.query:
-                now_api_url = f"{now_api_url}?{parsed_now_url.query}"
-    now_refresh_enabled = now_api_url.startswith("/")
-    now_data = {**now_data, "refresh_enabled": now_refresh_enabled}
-
-    latest_notes_title = str(home_settings.get("latest_notes_title", "Últimas notas")).strip() or "Últimas notas"
-    latest_notes_subtitle = str(home_settings.get("latest_notes_subtitle", "")).strip()
-    latest_notes_limit = _to_positive_int(home_settings.get("latest_notes_limit", 4), default=4)
-    notes_page_size = _to_positive_int(notes_settings.get("page_size", 10), default=10)
+    now_data = {**now_data, "refresh_enabled": build_config.now_refresh_enabled}
+    notes_page_size = build_config.notes_page_size
     total_notes = len(all_notes)
+    total_pages = max(1, (total_notes + notes_page_size - 1) // notes_page_size)
     status_summary = status_bundle.get("summary", {})
     tiny_thing = utils.pick_tiny_thing(tiny_lines, built_at)
 
+    jinja_cache_dir = paths.cache_dir / "jinja"
+    utils.ensure_dir(jinja_cache_dir)
     env = Environment(
-        loader=FileSystemLoader(str(templates_dir)),
+        loader=FileSystemLoader(str(paths.templates_dir)),
         autoescape=select_autoescape(["html", "xml"]),
         trim_blocks=True,
         lstrip_blocks=True,
+        bytecode_cache=FileSystemBytecodeCache(str(jinja_cache_dir)),
     )
 
     base_context = {
         "site": site,
-        "about": about,
-        "status_bar": status_bar,
-        "footer": footer,
+        "about": build_config.about,
+        "status_bar": build_config.status_bar,
+        "footer": build_config.footer,
         "build": build_info,
         "status_summary": status_summary,
         "status": status_bundle.get("status", {}),
@@ -167,51 +177,62 @@ def main() -> None:
             "status": status_bundle.get("status", {}).get("source", "unknown"),
         },
         "build_id": build_id,
-        "now_api_url": now_api_url,
-        "now_stream_url": now_stream_url,
-        "now_player_stream_url": now_player_stream_url,
+        "now_api_url": build_config.now_api_url,
+        "now_stream_url": build_config.now_stream_url,
+        "now_player_stream_url": build_config.now_player_stream_url,
     }
+    # Shared values live in the environment globals so each render only passes page-specific keys.
+    env.globals.update(base_context)
+    # Compile every template once up front; the page loops only render.
+    templates = {name: env.get_template(name) for name in TEMPLATE_NAMES}
+
+    # Create every output directory once instead of checking it before each page write.
+    output_dirs = {
+        paths.output_dir,
+        paths.output_dir / "notes",
+        paths.output_dir / "links",
+        paths.output_dir / "now",
+        paths.output_dir / "about",
+        *(paths.output_dir / "notes" / "page" / str(page) for page in range(2, total_pages + 1)),
+        *(paths.output_dir / "notes" / note["slug"] for note in all_notes),
+    }
+    for directory in output_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
 
     render_template(
-        env,
-        "index.html",
-        output_dir / "index.html",
+        templates["index.html"],
+        paths.output_dir / "index.html",
         {
-            **base_context,
             "page_title": "Inicio",
             "current_path": "/",
-            "latest_notes": all_notes[:latest_notes_limit],
+            "latest_notes": all_notes[: build_config.latest_notes_limit],
             "total_notes_count": total_notes,
             "links_preview": links_preview,
-            "latest_notes_title": latest_notes_title,
-            "latest_notes_subtitle": latest_notes_subtitle,
+            "latest_notes_title": build_config.latest_notes_title,
+            "latest_notes_subtitle": build_config.latest_notes_subtitle,
             "tiny_thing": tiny_thing,
         },
     )
 
     render_template(
-        env,
-        "404.html",
-        output_dir / "404.html",
+        templates["404.html"],
+        paths.output_dir / "404.html",
         {
-            **base_context,
             "page_title": "404",
             "current_path": "",
         },
     )
 
-    total_pages = max(1, (total_notes + notes_page_size - 1) // notes_page_size)
-
     for page in range(1, total_pages + 1):
         start = (page - 1) * notes_page_size
         end = start + notes_page_size
         page_notes = all_notes[start:end]
 
         if page == 1:
-            destination = output_dir / "notes" / "index.html"
+            destination = paths.output_dir / "notes" / "index.html"
             current_path = "/notes/"
         else:
-            destination = output_dir / "notes" / "page" / str(page) / "index.html"
+            destination = paths.output_dir / "notes" / "page" / str(page) / "index.html"
             current_path = f"/notes/page/{page}/"
 
         prev_url = ""
@@ -231,11 +252,9 @@ def main() -> None:
         }
 
         render_template(
-            env,
-            "notes_index.html",
+            templates["notes_index.html"],
             destination,
             {
-                **base_context,
                 "page_title": "Notas",
                 "current_path": current_path,
                 "notes": page_notes,
@@ -245,24 +264,26 @@ def main() -> None:
         )
 
     for note in all_notes:
+        destination = paths.output_dir / "notes" / note["slug"] / "index.html"
+        if args.incremental and utils.is_output_fresh(destination, max(note["source_mtime"], inputs_mtime)):
+            continue
         render_template(
-            env,
-            "note_detail.html",
-            output_dir / "notes" / note["slug"] / "index.html",
+            templates["note_detail.html"],
+            destination,
             {
-                **base_context,
                 "page_title": note["title"],
                 "current_path": f"/notes/{note['slug']}/",
                 "note": note,
             },
         )
 
+    if args.incremental:
+        _prune_stale_note_pages(paths.output_dir / "notes", {note["slug"] for note in all_notes}, total_pages)
+
     render_template(
-        env,
-        "links_index.html",
-        output_dir / "links" / "index.html",
+        templates["links_index.html"],
+        paths.output_dir / "links" / "index.html",
         {
-            **base_context,
             "page_title": "Links",
             "current_path": "/links/",
             "links": all_links,
@@ -270,11 +291,9 @@ def main() -> None:
     )
 
     render_template(
-        env,
-        "now_index.html",
-        output_dir / "now" / "index.html",
+        templates["now_index.html"],
+        paths.output_dir / "now" / "index.html",
         {
-            **base_context,
             "page_title": "Ahora sonando",
             "current_path": "/now/",
             "history": now_history,
@@ -282,37 +301,33 @@ def main() -> None:
     )
 
     render_template(
-        env,
-        "about_index.html",
-        output_dir / "about" / "index.html",
+        templates["about_index.html"],
+        paths.output_dir / "about" / "index.html",
         {
-            **base_context,
             "page_title": "Acerca",
             "current_path": "/about/",
         },
     )
 
-    utils.ensure_dir(output_dir / "notes")
-    (output_dir / "notes" / "rss.xml").write_text(notes.build_rss(all_notes, site), encoding="utf-8")
-    (output_dir / "notes" / "atom.xml").write_text(
-        notes.build_atom(all_notes, site, built_at), encoding="utf-8"
-    )
-    (output_dir / "notes" / "feed.json").write_text(
-        notes.build_json_feed(all_notes, site), encoding="utf-8"
-    )
+    rss_feed, atom_feed, json_feed = notes.build_all_feeds(all_notes, site, built_at)
+    utils.write_if_changed(paths.output_dir / "notes" / "rss.xml", rss_feed)
+    utils.write_if_changed(paths.output_dir / "notes" / "atom.xml", atom_feed)
+    utils.write_if_changed(paths.output_dir / "notes" / "feed.json", json_feed)
 
-    utils.copy_static_tree(static_dir, output_dir / "assets")
+    utils.copy_static_tree(paths.static_dir, paths.output_dir / "assets")
 
     # Publish favicon assets at the domain root so crawlers can discover them reliably.
-    favicon_svg_source = static_dir / "favicon.svg"
+    favicon_svg_source = paths.static_dir / "favicon.svg"
     if favicon_svg_source.exists():
-        favicon_svg = favicon_svg_source.read_text(encoding="utf-8")
-        (output_dir / "favicon.svg").write_text(favicon_svg, encoding="utf-8")
-        (output_dir / "favicon-v2.svg").write_text(favicon_svg, encoding="utf-8")
+        shutil.copyfile(favicon_svg_source, paths.output_dir / "favicon.svg")
+        shutil.copyfile(favicon_svg_source, paths.output_dir / "favicon-v2.svg")
 
-    favicon_ico_source = static_dir / "favicon.ico"
+    favicon_ico_source = paths.static_dir / "favicon.ico"
     if favicon_ico_source.exists():
-        (output_dir / "favicon.ico").write_bytes(favicon_ico_source.read_bytes())
+        shutil.copyfile(favicon_ico_source, paths.output_dir / "favicon.ico")
+
+    # Stale-while-revalidate refreshes ran alongside rendering; let them land for the next build.
+    utils.wait_for_background_refreshes()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from . import utils
+
+SITE_HOSTS = {"nico.com.ar", "www.nico.com.ar"}
+
+
+def _dict_setting(config: dict[str, Any], key: str) -> dict[str, Any]:
+    value = config.get(key, {})
+    return value if isinstance(value, dict) else {}
+
+
+def _to_positive_int(raw_value: Any, default: int) -> int:
+    try:
+        value = int(raw_value)
+    except (TypeError, ValueError):
+        return default
+    if value <= 0:
+        return default
+    return value
+
+
+def _normalize_footer(footer: dict[str, Any]) -> dict[str, Any]:
+    footer_links = footer.get("links", [])
+    if not isinstance(footer_links, list):
+        footer_links = []
+
+    normalized_footer_links: list[dict[str, str]] = []
+    for item in footer_links:
+        if not isinstance(item, dict):
+            continue
+        label = str(item.get("label", "")).strip()
+        href = str(item.get("href", "")).strip()
+        if label and href:
+            normalized_footer_links.append({"label": label, "href": href})
+    return {"links": normalized_footer_links}
+
+
+def _now_api_url(source_url: str) -> str:
+    # Same-site endpoints are requested with a relative URL so the browser can refresh them.
+    parsed = urlparse(source_url)
+    if not (parsed.scheme and parsed.netloc) or parsed.netloc.lower() not in SITE_HOSTS:
+        return source_url
+
+    api_url = parsed.path or "/api/now-playing"
+    if parsed.query:
+        api_url = f"{api_url}?{parsed.query}"
+    return api_url
+
+
+@dataclass(frozen=True)
+class BuildConfig:
+    raw: dict[str, Any]
+    site: dict[str, Any]
+    about: Any
+    status_bar: dict[str, Any]
+    footer: dict[str, Any]
+    feeds_ttl_minutes: int
+    latest_notes_title: str
+    latest_notes_subtitle: str
+    latest_notes_limit: int
+    notes_page_size: int
+    now_api_url: str
+    now_refresh_enabled: bool
+    now_stream_url: str
+    now_player_stream_url: str
+
+    @classmethod
+    def from_yaml(cls, path: Path) -> BuildConfig:
+        raw = utils.load_yaml(path, default={})
+        if not isinstance(raw, dict):
+            raw = {}
+
+        site = _dict_setting(raw, "site")
+        status_bar = _dict_setting(raw, "status_bar")
+        now_playing_settings = _dict_setting(raw, "now_playing")
+        home_settings = _dict_setting(raw, "home")
+        notes_settings = _dict_setting(raw, "notes")
+
+        site_power = str(site.get("power", "")).strip()
+        if not site_power:
+            site_power = str(status_bar.get("power_label", "grid")).strip() or "grid"
+
+        now_api_url = _now_api_url(str(now_playing_settings.get("source_url", "")).strip())
+
+        return cls(
+            raw=raw,
+            site={**site, "power": site_power},
+            about=raw.get("about", {}),
+            status_bar={"power_label": site_power},
+            footer=_normalize_footer(_dict_setting(raw, "footer")),
+            feeds_ttl_minutes=int(raw.get("feeds_ttl_minutes", 30)),
+            latest_notes_title=str(home_settings.get("latest_notes_title", "Últimas notas")).strip()
+            or "Últimas notas",
+            latest_notes_subtitle=str(home_settings.get("latest_notes_subtitle", "")).strip(),
+            latest_notes_limit=_to_positive_int(home_settings.get("latest_notes_limit", 4), default=4),
+            notes_page_size=_to_positive_int(notes_settings.get("page_size", 10), default=10),
+            now_api_url=now_api_url,
+            now_refresh_enabled=now_api_url.startswith("/"),
+            now_stream_url=str(now_playing_settings.get("stream_url", "")).strip() or "https://www.blurfm.com/",
+            now_player_stream_url=str(now_playing_settings.get("player_stream_url", "")).strip()
+            or "https://stream.blurfm.com/high",
+        )
+
+
+@lru_cache(maxsize=1)
+def _load_cached(path: Path, mtime_ns: int) -> BuildConfig:
+    return BuildConfig.from_yaml(path)
+
+
+def load_build_config(path: Path) -> BuildConfig:
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = 0
+    return _load_cached(path, mtime_ns)
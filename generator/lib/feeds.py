@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import html
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
-from xml.etree import ElementTree
 
-import requests
 try:
     import feedparser
 except ModuleNotFoundError:  # pragma: no cover - runtime dependency fallback
     feedparser = None
+try:
+    from lxml import etree as _etree
+
+    # Never resolve entities or touch the network while parsing remote feeds.
+    _XML_PARSER = _etree.XMLParser(resolve_entities=False, no_network=True)
+except ModuleNotFoundError:  # pragma: no cover - optional dependency fallback
+    from xml.etree import ElementTree as _etree
+
+    _XML_PARSER = None
 
 from . import utils
 
+FEED_USER_AGENT = "pizero-portal/1.0 (+https://nico.com.ar)"
+FEED_TIMEOUT_SECONDS = 6
+
 PREVIEW_SOURCE_LIMITS = {
     "Hacker News Frontpage": 1,
     "The Verge": 1,
@@ -45,7 +56,7 @@ def _entry_datetime(entry: dict[str, Any]) -> datetime | None:
 
 
 def _parse_xml_fallback(content: bytes) -> list[dict[str, str]]:
-    root = ElementTree.fromstring(content)
+    root = _etree.fromstring(content, parser=_XML_PARSER)
     entries: list[dict[str, str]] = []
 
     # RSS style feeds.
@@ -88,20 +99,13 @@ def _parse_xml_fallback(content: bytes) -> list[dict[str, str]]:
     return entries
 
 
-def _fetch_feed(feed_name: str, feed_url: str, timeout_seconds: int = 6) -> list[dict[str, str]]:
-    response = requests.get(
-        feed_url,
-        timeout=timeout_seconds,
-        headers={"User-Agent": "pizero-portal/1.0 (+https://nico.com.ar)"},
-    )
-    response.raise_for_status()
-
-    items: list[dict[str, str]] = []
+def _parse_feed_content(feed_name: str, content: bytes) -> list[dict[str, Any]]:
+    items: list[dict[str, Any]] = []
     if feedparser is not None:
-        parsed = feedparser.parse(response.content)
+        parsed = feedparser.parse(content)
         parsed_entries = parsed.entries[:12]
     else:
-        parsed_entries = _parse_xml_fallback(response.content)[:12]
+        parsed_entries = _parse_xml_fallback(content)[:12]
 
     for entry in parsed_entries:
         link = str(entry.get("link") or "").strip()
@@ -116,12 +120,90 @@ def _fetch_feed(feed_name: str, feed_url: str, timeout_seconds: int = 6) -> list
                 "url": link,
                 "source": feed_name,
                 "published": published.isoformat() if published is not None else "",
+                # Transient: lets the caller sort without re-parsing the ISO string.
+                "published_dt": published,
             }
         )
 
     return items
 
 
+def _cached_datetime(raw: dict[str, Any]) -> datetime | None:
+    epoch = raw.get("published_epoch")
+    if isinstance(epoch, (int, float)):
+        try:
+            offset = timezone(timedelta(seconds=int(raw.get("published_utcoffset", 0))))
+            return datetime.fromtimestamp(epoch, tz=offset)
+        except (TypeError, ValueError, OverflowError, OSError):
+            pass
+    # Cache files written before published_epoch existed only carry the ISO string.
+    return _safe_datetime(raw.get("published"))
+
+
+def _fetch_feed(feed_name: str, feed_url: str, timeout_seconds: int = FEED_TIMEOUT_SECONDS) -> list[dict[str, Any]]:
+    # Only needed when a feed is fetched without aiohttp; cached builds never import requests.
+    import requests
+
+    response = requests.get(
+        feed_url,
+        timeout=timeout_seconds,
+        headers={"User-Agent": FEED_USER_AGENT},
+    )
+    response.raise_for_status()
+    return _parse_feed_content(feed_name, response.content)
+
+
+async def _fetch_feed_async(session: Any, feed_name: str, feed_url: str) -> list[dict[str, Any]]:
+    async with session.get(feed_url) as response:
+        response.raise_for_status()
+        content = await response.read()
+    return _parse_feed_content(feed_name, content)
+
+
+async def _gather_all(feed_targets: list[tuple[str, str]]) -> list[list[dict[str, Any]] | BaseException]:
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=4)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=FEED_TIMEOUT_SECONDS),
+        headers={"User-Agent": FEED_USER_AGENT},
+        # Honour HTTP(S)_PROXY / NO_PROXY like the requests fallback does.
+        trust_env=True,
+    ) as session:
+        return await asyncio.gather(
+            *(_fetch_feed_async(session, name, url) for name, url in feed_targets),
+            return_exceptions=True,
+        )
+
+
+def _fetch_all_feeds(feed_targets: list[tuple[str, str]]) -> list[dict[str, Any]]:
+    all_items: list[dict[str, Any]] = []
+
+    # Imported only when feeds are actually fetched; cache hits never pay aiohttp's import time.
+    try:
+        import aiohttp
+    except ModuleNotFoundError:  # pragma: no cover - optional dependency fallback
+        aiohttp = None
+
+    if aiohttp is not None:
+        # Fetch every feed concurrently so total latency is the slowest feed, not the sum.
+        for result in asyncio.run(_gather_all(feed_targets)):
+            if isinstance(result, BaseException):
+                # Individual feed errors are expected in unreliable environments.
+                continue
+            all_items.extend(result)
+        return all_items
+
+    for name, url in feed_targets:
+        try:
+            all_items.extend(_fetch_feed(name, url))
+        except Exception:
+            # Individual feed errors are expected in unreliable environments.
+            continue
+    return all_items
+
+
 def _fallback_items(feed_list: list[dict[str, Any]]) -> dict[str, Any]:
     now = datetime.now(tz=timezone.utc)
     links = []
@@ -141,29 +223,33 @@ def _fallback_items(feed_list: list[dict[str, Any]]) -> dict[str, Any]:
 def fetch_links(content_path: Path, cache_dir: Path, ttl_minutes: int, limit: int = 120) -> tuple[list[dict[str, Any]], str]:
     feeds_yaml = utils.load_yaml(content_path, default={})
     feed_list = list(feeds_yaml.get("feeds", []))
+    # ISO string -> datetime for items fetched in this run, so they are not parsed twice.
+    parsed_published: dict[str, datetime] = {}
 
     def fetcher() -> dict[str, Any]:
-        all_items: list[dict[str, str]] = []
+        feed_targets: list[tuple[str, str]] = []
         for feed in feed_list:
             name = str(feed.get("name", "feed"))
             url = str(feed.get("url", "")).strip()
-            if not url:
-                continue
-            try:
-                all_items.extend(_fetch_feed(name, url))
-            except Exception:
-                # Individual feed errors are expected in unreliable environments.
-                continue
+            if url:
+                feed_targets.append((name, url))
 
+        all_items = _fetch_all_feeds(feed_targets)
         if not all_items:
             raise RuntimeError("no feed data fetched")
 
-        all_items.sort(
-            key=lambda item: _safe_datetime(item.get("published")) or datetime.min.replace(tzinfo=timezone.utc),
-            reverse=True,
-        )
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        all_items.sort(key=lambda item: item["published_dt"] or oldest, reverse=True)
+        for item in all_items:
+            published_dt = item.pop("published_dt")
+            if published_dt is not None:
+                parsed_published[item["published"]] = published_dt
+                # Epoch + offset rebuild the same datetime on cache hits without ISO parsing; the
+                # float keeps microseconds so cached and live renders match.
+                item["published_epoch"] = published_dt.timestamp()
+                item["published_utcoffset"] = int(published_dt.utcoffset().total_seconds())
         return {
-            "updated_at": datetime.now(tz=timezone.utc).isoformat(),
+            "updated_at": utils.utc_now_iso(),
             "items": all_items[:limit],
         }
 
@@ -177,7 +263,10 @@ def fetch_links(content_path: Path, cache_dir: Path, ttl_minutes: int, limit: in
 
     items = []
     for raw in payload.get("items", [])[:limit]:
-        published = _safe_datetime(raw.get("published"))
+        raw_published = raw.get("published")
+        published = parsed_published.get(raw_published) if isinstance(raw_published, str) else None
+        if published is None:
+            published = _cached_datetime(raw)
         items.append(
             {
                 "title": html.unescape(str(raw.get("title", "(untitled)"))),
@@ -1,18 +1,45 @@
 from __future__ import annotations
 
+import logging
+import os
+import random
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 from urllib.parse import urlparse
 
-import requests
-
 from . import utils
 
-LOG_PREFIX = "[now-playing]"
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+# "Artist - Track" titles, with a hyphen, en dash or em dash separator.
+TITLE_SEPARATOR_PATTERN = re.compile(" [-–—] ")
+NOW_TEXT_KEYS = ("track", "artist", "song", "title")
+# Fallback keys in priority order; the first truthy value wins.
+NOW_ARTIST_FALLBACK_KEYS = ("server_name", "dj")
+NOW_URL_KEYS = ("url", "listenurl", "server_url")
+NOW_STARTED_KEYS = ("started_at", "stream_start", "started", "timestamp")
+HISTORY_PLAYED_KEYS = ("played_at", "started_at", "stream_start", "timestamp")
+SOURCE_MOUNT_KEYS = ("mount", "listenurl", "server_url", "url")
+# Returned by _fetch_source_json when the endpoint answers 304 Not Modified.
+NOT_MODIFIED = object()
+# Source caches larger than this are treated as corrupt and refetched instead of decoded.
+MAX_SOURCE_CACHE_BYTES = 256 * 1024
+
+# (cache file, mount) -> (cache mtime_ns, fetched_at, result) for results served from a fresh cache.
+_SOURCE_MEMO: dict[tuple[Path, str], tuple[int, float, tuple[dict[str, Any], list[dict[str, Any]], str]]] = {}
 
+# Diagnostics are debug-level so normal builds skip formatting them; build.py --verbose shows them.
+_LOG = logging.getLogger("now-playing")
 
-def _log(message: str) -> None:
-    print(f"{LOG_PREFIX} {message}")
+# Connections kept per host for source and legacy endpoints (httpx client or requests session,
+# created lazily).
+HTTP_POOL_SIZE = 4
 
 
 def _clean_text(value: Any) -> str:
@@ -21,6 +48,14 @@ def _clean_text(value: Any) -> str:
     return str(value).strip()
 
 
+def _first(record: dict[str, Any], keys: tuple[str, ...], default: Any = "") -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value:
+            return value
+    return default
+
+
 def _unavailable_now() -> dict[str, Any]:
     return {
         "track": "No disponible",
@@ -33,15 +68,27 @@ def _unavailable_now() -> dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=512)
+def _format_cached_timestamp(raw: str | int | float) -> tuple[str, str]:
+    parsed = utils.to_datetime(raw)
+    return parsed.isoformat(), parsed.strftime("%Y-%m-%d %H:%M")
+
+
+def _format_timestamp(raw: Any) -> tuple[str, str]:
+    # History rows barely change between runs, so most timestamps are already formatted.
+    if isinstance(raw, (str, int, float)):
+        return _format_cached_timestamp(raw)
+    parsed = utils.to_datetime(raw)
+    return parsed.isoformat(), parsed.strftime("%Y-%m-%d %H:%M")
+
+
 def _normalize_now(item: dict[str, Any], *, live: bool) -> dict[str, Any]:
     started_raw = item.get("started_at")
     started_label = ""
     started_at = ""
 
     if started_raw:
-        parsed_started = utils.to_datetime(started_raw)
-        started_at = parsed_started.isoformat()
-        started_label = parsed_started.strftime("%Y-%m-%d %H:%M")
+        started_at, started_label = _format_timestamp(started_raw)
 
     return {
         "track": str(item.get("track", "No disponible")),
@@ -54,40 +101,70 @@ def _normalize_now(item: dict[str, Any], *, live: bool) -> dict[str, Any]:
     }
 
 
+def _make_history_row(item: dict[str, Any]) -> dict[str, Any]:
+    played_at_raw = item.get("played_at")
+    played_at, played_label = _format_timestamp(played_at_raw) if played_at_raw else ("", "")
+    return {
+        "track": str(item.get("track", "Desconocido")),
+        "artist": str(item.get("artist", "Desconocido")),
+        "url": str(item.get("url", "")),
+        "played_at": played_at,
+        "played_label": played_label,
+    }
+
+
 def _normalize_history(history: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    rows = []
-    for item in history[:30]:
-        played_at_raw = item.get("played_at")
-        played_label = ""
-        played_at = ""
-        if played_at_raw:
-            parsed_played = utils.to_datetime(played_at_raw)
-            played_at = parsed_played.isoformat()
-            played_label = parsed_played.strftime("%Y-%m-%d %H:%M")
-
-        rows.append(
-            {
-                "track": str(item.get("track", "Desconocido")),
-                "artist": str(item.get("artist", "Desconocido")),
-                "url": str(item.get("url", "")),
-                "played_at": played_at,
-                "played_label": played_label,
-            }
-        )
-    return rows
+    return list(map(_make_history_row, history[:30]))
+
+
+def _request_with_diagnostics(
+    url: str,
+    timeout_sec: float,
+    headers: dict[str, str] | None = None,
+) -> requests.Response | httpx.Response:
+    _LOG.debug("request_url=%s", url)
+    response = utils.pooled_http_client(HTTP_POOL_SIZE).get(url, timeout=timeout_sec, headers=headers)
+    _LOG.debug("status_code=%s", response.status_code)
+    # httpx also raises for 3xx; a 304 is the revalidation answer _fetch_source_json expects.
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
 
 
 def _fetch_json_with_diagnostics(url: str, timeout_sec: float) -> dict[str, Any]:
-    _log(f"request_url={url}")
-    response = requests.get(url, timeout=timeout_sec)
-    _log(f"status_code={response.status_code}")
-    response.raise_for_status()
+    return _decode_json_with_diagnostics(_request_with_diagnostics(url, timeout_sec))
+
+
+def _fetch_source_json(
+    url: str,
+    timeout_sec: float,
+    validators: dict[str, str],
+) -> tuple[Any, dict[str, str]]:
+    # Revalidate with the cached ETag / Last-Modified; a 304 means the cached payload is current.
+    headers: dict[str, str] = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = _request_with_diagnostics(url, timeout_sec, headers=headers or None)
+    if response.status_code == 304:
+        return NOT_MODIFIED, validators
+
+    fresh_validators = {
+        "etag": response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+    }
+    return _decode_json_with_diagnostics(response), fresh_validators
+
+
+def _decode_json_with_diagnostics(response: requests.Response | httpx.Response) -> Any:
     try:
-        payload = response.json()
-        _log("json_parse=true")
+        payload = utils.loads_json(response.content)
+        _LOG.debug("json_parse=true")
         return payload
     except ValueError:
-        _log("json_parse=false")
+        _LOG.debug("json_parse=false")
         raise
 
 
@@ -111,8 +188,9 @@ def _read_local_json(path: Path, default: Any) -> Any:
     return data
 
 
-def _normalize_mount(value: Any) -> str:
-    raw = str(value or "").strip()
+@lru_cache(maxsize=256)
+def _normalize_mount(value: str) -> str:
+    raw = value.strip()
     if not raw:
         return ""
     parsed = urlparse(raw)
@@ -126,17 +204,30 @@ def _normalize_mount(value: Any) -> str:
 
 def _split_title(value: str) -> tuple[str, str]:
     cleaned = value.strip()
-    for separator in (" - ", " – ", " — "):
-        if separator in cleaned:
-            artist, track = cleaned.split(separator, 1)
-            return artist.strip(), track.strip()
+    parts = TITLE_SEPARATOR_PATTERN.split(cleaned, 1)
+    if len(parts) == 2:
+        return parts[0].strip(), parts[1].strip()
     return "", cleaned
 
 
-def _extract_now_payload(record: dict[str, Any], default_url: str = "") -> dict[str, Any]:
-    title = _clean_text(record.get("title"))
-    track = _clean_text(record.get("track") or record.get("song"))
-    artist = _clean_text(record.get("artist") or record.get("server_name") or record.get("dj"))
+def _clean_now_fields(record: dict[str, Any]) -> dict[str, str]:
+    return {key: _clean_text(record.get(key)) for key in NOW_TEXT_KEYS}
+
+
+def _extract_now_payload(
+    record: dict[str, Any],
+    default_url: str = "",
+    cleaned: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    if cleaned is None:
+        title = _clean_text(record.get("title"))
+        track = _clean_text(record.get("track") or record.get("song"))
+        artist = _clean_text(record.get("artist") or _first(record, NOW_ARTIST_FALLBACK_KEYS))
+    else:
+        # Same raw-value `or` fallbacks as above, reusing the text cleaned for the presence check.
+        title = cleaned["title"]
+        track = cleaned["track"] if record.get("track") else cleaned["song"]
+        artist = cleaned["artist"] if record.get("artist") else _clean_text(_first(record, NOW_ARTIST_FALLBACK_KEYS))
 
     if title and (not track or not artist):
         parsed_artist, parsed_track = _split_title(title)
@@ -147,21 +238,8 @@ def _extract_now_payload(record: dict[str, Any], default_url: str = "") -> dict[
 
     track = track or title
     artist = artist or "Desconocido"
-    stream_url = _clean_text(
-        record.get("url")
-        or record.get("listenurl")
-        or record.get("server_url")
-        or default_url
-        or ""
-    )
-
-    started_at = (
-        record.get("started_at")
-        or record.get("stream_start")
-        or record.get("started")
-        or record.get("timestamp")
-        or ""
-    )
+    stream_url = _clean_text(_first(record, NOW_URL_KEYS, default_url or ""))
+    started_at = _first(record, NOW_STARTED_KEYS)
 
     return {
         "track": track,
@@ -173,13 +251,7 @@ def _extract_now_payload(record: dict[str, Any], default_url: str = "") -> dict[
 
 def _extract_history_payload(record: dict[str, Any], default_url: str = "") -> dict[str, Any]:
     now_payload = _extract_now_payload(record, default_url=default_url)
-    played_at = (
-        record.get("played_at")
-        or record.get("started_at")
-        or record.get("stream_start")
-        or record.get("timestamp")
-        or ""
-    )
+    played_at = _first(record, HISTORY_PLAYED_KEYS)
     return {
         "track": now_payload["track"],
         "artist": now_payload["artist"],
@@ -205,26 +277,24 @@ def _extract_sources(payload: dict[str, Any]) -> list[dict[str, Any]]:
     return sources
 
 
-def _matches_mount(source: dict[str, Any], mount: str) -> bool:
-    target_mount = _normalize_mount(mount)
+def _matches_mount(source: dict[str, Any], target_mount: str) -> bool:
     if not target_mount:
         return True
 
-    candidates = [
-        source.get("mount"),
-        source.get("listenurl"),
-        source.get("server_url"),
-        source.get("url"),
-    ]
-    for candidate in candidates:
-        if _normalize_mount(candidate) == target_mount:
+    for key in SOURCE_MOUNT_KEYS:
+        candidate = source.get(key)
+        # Empty candidates normalize to "" and can never match a non-empty target.
+        if not candidate:
+            continue
+        if _normalize_mount(str(candidate)) == target_mount:
             return True
     return False
 
 
 def _select_source(sources: list[dict[str, Any]], mount: str) -> dict[str, Any] | None:
+    target_mount = _normalize_mount(str(mount or ""))
     for source in sources:
-        if _matches_mount(source, mount):
+        if _matches_mount(source, target_mount):
             return source
     return sources[0] if sources else None
 
@@ -232,6 +302,8 @@ def _select_source(sources: list[dict[str, Any]], mount: str) -> dict[str, Any]
 def _parse_source_payload(
     payload: dict[str, Any],
     mount: str,
+    want_history: bool = True,
+    sources: list[dict[str, Any]] | None = None,
 ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
     if not isinstance(payload, dict):
         return None, []
@@ -240,30 +312,42 @@ def _parse_source_payload(
         return None, []
 
     default_url = str(payload.get("url") or payload.get("listenurl") or "").strip()
-    now_payload: dict[str, Any] | None = None
 
+    # A matching Icecast source wins over "now" and top-level fields; extract only the chosen record.
+    record: dict[str, Any] | None = None
+    cleaned: dict[str, str] | None = None
+    if sources is None:
+        sources = _extract_sources(payload)
+    selected_source = _select_source(sources, mount)
     raw_now = payload.get("now")
-    if isinstance(raw_now, dict):
-        now_payload = _extract_now_payload(raw_now, default_url=default_url)
-    elif any(_clean_text(payload.get(key)) for key in ("track", "artist", "song", "title")):
-        now_payload = _extract_now_payload(payload, default_url=default_url)
-
-    selected_source = _select_source(_extract_sources(payload), mount)
     if selected_source:
-        now_payload = _extract_now_payload(selected_source, default_url=default_url)
+        record = selected_source
+    elif isinstance(raw_now, dict):
+        record = raw_now
+    else:
+        # Top-level fields: clean them once for both the presence check and the extraction.
+        cleaned = _clean_now_fields(payload)
+        if any(cleaned.values()):
+            record = payload
 
-    raw_history = payload.get("history")
-    if not isinstance(raw_history, list):
-        raw_history = payload.get("now_history")
-    if not isinstance(raw_history, list):
-        raw_history = []
+    now_payload = (
+        _extract_now_payload(record, default_url=default_url, cleaned=cleaned) if record is not None else None
+    )
 
     history_payload: list[dict[str, Any]] = []
-    item_default_url = now_payload["url"] if now_payload else default_url
-    for item in raw_history:
-        if not isinstance(item, dict):
-            continue
-        history_payload.append(_extract_history_payload(item, default_url=item_default_url))
+    # Callers that only render "now" (cached or stale payloads) skip history extraction entirely.
+    if want_history:
+        raw_history = payload.get("history")
+        if not isinstance(raw_history, list):
+            raw_history = payload.get("now_history")
+        if not isinstance(raw_history, list):
+            raw_history = []
+
+        item_default_url = now_payload["url"] if now_payload else default_url
+        for item in raw_history:
+            if not isinstance(item, dict):
+                continue
+            history_payload.append(_extract_history_payload(item, default_url=item_default_url))
 
     if now_payload is None:
         return None, history_payload
@@ -277,8 +361,8 @@ def _parse_source_payload(
     return now_payload, history_payload
 
 
-def _payload_title_for_log(payload: dict[str, Any], mount: str) -> str:
-    selected_source = _select_source(_extract_sources(payload), mount)
+def _payload_title_for_log(payload: dict[str, Any], sources: list[dict[str, Any]], mount: str) -> str:
+    selected_source = _select_source(sources, mount)
     if selected_source:
         title = _clean_text(selected_source.get("title") or selected_source.get("track") or selected_source.get("song"))
         if title:
@@ -287,6 +371,91 @@ def _payload_title_for_log(payload: dict[str, Any], mount: str) -> str:
     return _clean_text(payload.get("title") or payload.get("track") or payload.get("song"))
 
 
+def _read_source_cache(path: Path, stat: os.stat_result | None) -> tuple[Any, float | None, dict[str, str]]:
+    if stat is None:
+        return None, None, {}
+    if stat.st_size > MAX_SOURCE_CACHE_BYTES:
+        _LOG.warning("cache_oversized=true bytes=%s", stat.st_size)
+        return None, None, {}
+
+    cached = utils.read_json(path, None)
+    if isinstance(cached, dict) and "fetched_at" in cached and "payload" in cached:
+        validators = {
+            "etag": str(cached.get("etag") or ""),
+            "last_modified": str(cached.get("last_modified") or ""),
+        }
+        # The fetch time travels with the payload, so freshness needs no extra stat().
+        try:
+            fetched_at = float(cached["fetched_at"])
+        except (TypeError, ValueError):
+            fetched_at = None
+        return cached["payload"], fetched_at, validators
+
+    if cached is None:
+        return None, None, {}
+    # Cache files written before the envelope existed hold the bare payload; use the file mtime.
+    return cached, stat.st_mtime, {}
+
+
+def _within_ttl(fetched_at: float | None, ttl_seconds: int) -> bool:
+    if fetched_at is None or ttl_seconds <= 0:
+        return False
+    return time.time() - fetched_at <= ttl_seconds
+
+
+def _jittered_ttl(ttl_seconds: int) -> int:
+    # +/-10% so several generators sharing an upstream don't all expire on the same tick.
+    return max(round(ttl_seconds * random.uniform(0.9, 1.1)), 0)
+
+
+def _refresh_source_cache(
+    source_url: str,
+    timeout_sec: float,
+    mount: str,
+    cache_file: Path,
+    cached_payload: Any,
+    cached_validators: dict[str, str],
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    fetched_payload, validators = _fetch_source_json(
+        source_url,
+        timeout_sec=timeout_sec,
+        validators=cached_validators if cached_payload is not None else {},
+    )
+    if fetched_payload is NOT_MODIFIED:
+        # Unchanged upstream: reuse the decoded cache, but still rewrite it below so the new
+        # fetched_at restarts the TTL.
+        _LOG.debug("not_modified=true")
+        fetched_payload = cached_payload
+
+    if fetched_payload.get("success") is False:
+        _LOG.debug("payload_success=false")
+
+    # Walk sources/mounts/icestats once for the title check and both parses.
+    fetched_sources = _extract_sources(fetched_payload)
+    if _LOG.isEnabledFor(logging.DEBUG) and not _payload_title_for_log(fetched_payload, fetched_sources, mount=mount):
+        _LOG.debug("payload_title_empty=true")
+
+    fetched_now_payload, _ = _parse_source_payload(
+        fetched_payload, mount=mount, want_history=False, sources=fetched_sources
+    )
+    if fetched_now_payload is None:
+        raise ValueError("Source payload does not include a playable now item")
+
+    _SOURCE_MEMO.pop((cache_file, mount), None)
+    utils.write_json(
+        cache_file,
+        {"fetched_at": time.time(), **validators, "payload": fetched_payload},
+    )
+    return fetched_payload, fetched_sources
+
+
+def _log_refresh_errors(refresh: Callable[[], Any]) -> None:
+    try:
+        refresh()
+    except Exception as error:
+        _LOG.warning("background_refresh_error=%s", error)
+
+
 def _fetch_from_source_endpoint(
     config: dict[str, Any],
     cache_dir: Path,
@@ -301,65 +470,132 @@ def _fetch_from_source_endpoint(
         return None
     resolved_source_url = _resolve_source_url(config, source_url)
     if not resolved_source_url:
-        _log("source_url_unresolved=true")
+        _LOG.warning("source_url_unresolved=true")
         return _unavailable_now(), [], "unavailable"
 
     timeout_sec = float(settings.get("timeout_sec", 3) or 3)
     cache_ttl_sec = int(settings.get("cache_ttl_sec", 60) or 60)
     mount = str(settings.get("mount", "")).strip()
+    stale_while_revalidate = bool(settings.get("stale_while_revalidate", False))
+    stale_max_age_sec = int(settings.get("stale_max_age_sec", 600) or 0)
     source_cache_file = cache_dir / "now_source.json"
-    cached_payload = utils.read_json(source_cache_file, None)
+    ttl_seconds = max(cache_ttl_sec, 0)
+    if stale_while_revalidate:
+        ttl_seconds = _jittered_ttl(ttl_seconds)
+
+    # Warm path: an unchanged, still-fresh cache file maps to the result computed last time.
+    memo_key = (source_cache_file, mount)
+    try:
+        cache_stat: os.stat_result | None = source_cache_file.stat()
+    except FileNotFoundError:
+        cache_stat = None
+    cache_mtime_ns = cache_stat.st_mtime_ns if cache_stat is not None else None
+    memoized = _SOURCE_MEMO.get(memo_key)
+    if memoized is not None and memoized[0] == cache_mtime_ns and _within_ttl(memoized[1], ttl_seconds):
+        _LOG.debug("using_fresh_cache=true")
+        return memoized[2]
+
+    cached_payload, cached_fetched_at, cached_validators = _read_source_cache(source_cache_file, cache_stat)
+    cache_fresh = _within_ttl(cached_fetched_at, ttl_seconds)
+
+    def refresh() -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        return _refresh_source_cache(
+            resolved_source_url,
+            timeout_sec,
+            mount,
+            source_cache_file,
+            cached_payload,
+            cached_validators,
+        )
 
     payload: dict[str, Any] | None = None
+    payload_sources: list[dict[str, Any]] | None = None
     payload_source = "missing"
 
-    if cached_payload is not None and utils.is_cache_fresh(source_cache_file, max(cache_ttl_sec, 0)):
+    if cached_payload is not None and cache_fresh:
         payload = cached_payload
         payload_source = "cache"
-        _log("using_fresh_cache=true")
+        _LOG.debug("using_fresh_cache=true")
+    elif (
+        cached_payload is not None
+        and stale_while_revalidate
+        and utils.within_stale_max_age(cached_fetched_at, stale_max_age_sec)
+    ):
+        # Serve the expired cache now and refresh it off the critical path for the next build.
+        payload = cached_payload
+        payload_source = "stale-revalidating"
+        if utils.refresh_in_background(source_cache_file, lambda: _log_refresh_errors(refresh)):
+            _LOG.debug("background_refresh=true")
     else:
         try:
-            fetched_payload = _fetch_json_with_diagnostics(resolved_source_url, timeout_sec=timeout_sec)
-
-            if fetched_payload.get("success") is False:
-                _log("payload_success=false")
-
-            payload_title = _payload_title_for_log(fetched_payload, mount=mount)
-            if not payload_title:
-                _log("payload_title_empty=true")
-
-            fetched_now_payload, _ = _parse_source_payload(fetched_payload, mount=mount)
-            if fetched_now_payload is None:
-                raise ValueError("Source payload does not include a playable now item")
-
-            utils.write_json(source_cache_file, fetched_payload)
-            payload = fetched_payload
+            payload, payload_sources = refresh()
             payload_source = "live"
         except Exception as error:
-            _log(f"live_fetch_error={error}")
+            _LOG.warning("live_fetch_error=%s", error)
             if cached_payload is not None:
                 payload = cached_payload
                 payload_source = "stale"
-                _log("using_last_known_good_cache=true")
+                _LOG.debug("using_last_known_good_cache=true")
             else:
-                _log("no_last_known_good_cache=true")
+                _LOG.warning("no_last_known_good_cache=true")
                 return _unavailable_now(), [], "unavailable"
 
-    now_payload, history_payload = _parse_source_payload(payload or {}, mount=mount)
+    live = payload_source == "live"
+    now_payload, history_payload = _parse_source_payload(
+        payload or {}, mount=mount, want_history=live, sources=payload_sources
+    )
     if now_payload is None:
-        _log("playable_now_missing_in_cache=true")
+        _LOG.debug("playable_now_missing_in_cache=true")
         return _unavailable_now(), [], f"{payload_source}/none"
 
-    live = payload_source == "live"
     normalized_now = _normalize_now(now_payload, live=live)
 
     if not live:
-        return normalized_now, [], f"{payload_source}/disabled"
+        result = (normalized_now, [], f"{payload_source}/disabled")
+        if payload_source == "cache" and cache_mtime_ns is not None and cached_fetched_at is not None:
+            _SOURCE_MEMO[memo_key] = (cache_mtime_ns, cached_fetched_at, result)
+        return result
 
     normalized_history = _normalize_history(history_payload)
     return normalized_now, normalized_history, f"{payload_source}/live"
 
 
+def _future_result(future: Future, default: tuple[Any, str]) -> tuple[Any, str]:
+    try:
+        return future.result()
+    except Exception as error:
+        _LOG.warning("legacy_fetch_error=%s", error)
+        return default
+
+
+def _fetch_combined_endpoint(
+    combined_url: str,
+    cache_file: Path,
+    ttl_seconds: int,
+) -> tuple[dict[str, Any], list[dict[str, Any]], str]:
+    payload, payload_source = utils.fetch_json_with_cache(
+        cache_file,
+        ttl_seconds=ttl_seconds,
+        fetcher=lambda: _fetch_json_with_diagnostics(combined_url, timeout_sec=6),
+        fallback={},
+    )
+    if not isinstance(payload, dict):
+        payload = {}
+
+    live = payload_source == "live"
+    now_candidate, history_payload = _parse_source_payload(payload, mount="", want_history=live)
+    if now_candidate is None:
+        return _unavailable_now(), [], f"{payload_source}/none"
+
+    normalized_now = _normalize_now(now_candidate, live=live)
+
+    if not live:
+        return normalized_now, [], f"{payload_source}/disabled"
+
+    normalized_history = _normalize_history(history_payload)
+    return normalized_now, normalized_history, f"{payload_source}/{payload_source}"
+
+
 def _fetch_legacy_endpoints(
     config: dict[str, Any],
     cache_dir: Path,
@@ -367,27 +603,54 @@ def _fetch_legacy_endpoints(
 ) -> tuple[dict[str, Any], list[dict[str, Any]], str]:
     ttl_minutes = int(config.get("now_ttl_minutes", 5))
     ttl_seconds = max(ttl_minutes * 60, 0)
+
+    # One endpoint returning both "now" and "history" replaces the two-request path below.
+    combined_url = str(config.get("now_combined_url", "")).strip()
+    if combined_url:
+        return _fetch_combined_endpoint(combined_url, cache_dir / "now_combined.json", ttl_seconds)
+
     now_cache_file = cache_dir / "now_playing.json"
     history_cache_file = cache_dir / "now_history.json"
 
     now_url = str(config.get("now_playing_url", "")).strip()
     history_url = str(config.get("now_history_url", "")).strip()
 
-    if now_url:
-        now_payload, now_source = utils.fetch_json_with_cache(
-            now_cache_file,
-            ttl_seconds=ttl_seconds,
-            fetcher=lambda: _fetch_json_with_diagnostics(now_url, timeout_sec=6),
-            fallback={},
-        )
+    def load_now() -> tuple[Any, str]:
+        if now_url:
+            return utils.fetch_json_with_cache(
+                now_cache_file,
+                ttl_seconds=ttl_seconds,
+                fetcher=lambda: _fetch_json_with_diagnostics(now_url, timeout_sec=6),
+                fallback={},
+            )
+        return _read_local_json(now_cache_file, {}), "cache-local" if now_cache_file.exists() else "missing"
+
+    def load_history() -> tuple[Any, str]:
+        if history_url:
+            return utils.fetch_json_with_cache(
+                history_cache_file,
+                ttl_seconds=ttl_seconds,
+                fetcher=lambda: _fetch_json_with_diagnostics(history_url, timeout_sec=6),
+                fallback=[],
+            )
+        return _read_local_json(history_cache_file, []), "cache-local" if history_cache_file.exists() else "missing"
+
+    history_result: tuple[Any, str] | None = None
+    if now_url and history_url and not utils.is_cache_fresh(now_cache_file, ttl_seconds):
+        # Both endpoints are remote and "now" will hit the network: fetch them together so the
+        # build waits for the slower one only. A fresh "now" keeps history lazy (often unused).
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            now_future = executor.submit(load_now)
+            history_future = executor.submit(load_history)
+        now_payload, now_source = _future_result(now_future, ({}, "missing"))
+        history_result = _future_result(history_future, ([], "missing"))
     else:
-        now_payload = _read_local_json(now_cache_file, {})
-        now_source = "cache-local" if now_cache_file.exists() else "missing"
+        now_payload, now_source = load_now()
 
     if not isinstance(now_payload, dict):
         now_payload = {}
 
-    now_candidate, _ = _parse_source_payload(now_payload, mount="")
+    now_candidate, _ = _parse_source_payload(now_payload, mount="", want_history=False)
     if now_candidate is None:
         return _unavailable_now(), [], f"{now_source}/none"
 
@@ -397,16 +660,9 @@ def _fetch_legacy_endpoints(
     if not live:
         return normalized_now, [], f"{now_source}/disabled"
 
-    if history_url:
-        history_payload, history_source = utils.fetch_json_with_cache(
-            history_cache_file,
-            ttl_seconds=ttl_seconds,
-            fetcher=lambda: _fetch_json_with_diagnostics(history_url, timeout_sec=6),
-            fallback=[],
-        )
-    else:
-        history_payload = _read_local_json(history_cache_file, [])
-        history_source = "cache-local" if history_cache_file.exists() else "missing"
+    if history_result is None:
+        history_result = load_history()
+    history_payload, history_source = history_result
 
     if not isinstance(history_payload, list):
         history_payload = []
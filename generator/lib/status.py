@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import fcntl
+import re
 import subprocess
-from datetime import datetime, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import requests
+try:
+    from pystemd.dbuslib import DBus
+    from pystemd.systemd1 import Unit
+except ImportError:  # pragma: no cover - optional dependency fallback (also without libsystemd)
+    DBus = None
+    Unit = None
 
 from . import utils
 
@@ -20,10 +29,21 @@ SOURCE_LABELS = {
     "live": "en vivo",
     "cache": "cache",
     "stale": "cache vencida",
+    "stale-revalidating": "cache vencida (actualizando)",
     "fallback": "fallback",
     "unknown": "desconocido",
 }
 
+# systemctl is-active output -> status state; anything else is "unknown".
+SYSTEMD_STATES = {
+    "active": "up",
+    "activating": "degraded",
+    "reloading": "degraded",
+    "inactive": "down",
+    "failed": "down",
+    "deactivating": "down",
+}
+
 SYSTEMCTL_DETAIL_LABELS = {
     "active": "activo",
     "activating": "activando",
@@ -34,6 +54,12 @@ SYSTEMCTL_DETAIL_LABELS = {
     "unknown": "desconocido",
 }
 
+# Connections kept per host for HTTP checks (httpx client or requests session, created lazily).
+HTTP_POOL_SIZE = 16
+
+# One worker per collection group (metrics, systemd, HTTP), reused across refreshes.
+_COLLECT_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="status")
+
 
 def _status_settings(config: dict[str, Any]) -> dict[str, Any]:
     settings = config.get("status", {})
@@ -43,96 +69,234 @@ def _status_settings(config: dict[str, Any]) -> dict[str, Any]:
 
 
 def _check_systemd_service(name: str) -> dict[str, str]:
+    return _check_systemd_services([name])[0]
+
+
+def _systemd_service_row(name: str, state: str) -> dict[str, str]:
+    return {
+        "name": name,
+        "state": SYSTEMD_STATES.get(state, "unknown"),
+        "detail": SYSTEMCTL_DETAIL_LABELS.get(state, state),
+    }
+
+
+def _systemd_unit_id(name: str) -> str:
+    # Like systemctl, a bare name means a service unit.
+    return name if "." in name else f"{name}.service"
+
+
+def _systemd_states_via_dbus(names: list[str]) -> list[str] | None:
+    if Unit is None:
+        return None
+    # Read ActiveState over the system bus instead of forking systemctl; any failure falls back.
+    try:
+        with DBus() as bus:
+            return [
+                Unit(_systemd_unit_id(name).encode(), bus=bus, _autoload=True).Unit.ActiveState.decode()
+                for name in names
+            ]
+    except Exception:
+        return None
+
+
+def _check_systemd_services(names: list[str]) -> list[dict[str, str]]:
+    if not names:
+        return []
+
+    dbus_states = _systemd_states_via_dbus(names)
+    if dbus_states is not None:
+        return [_systemd_service_row(name, state or "unknown") for name, state in zip(names, dbus_states)]
+
+    # `systemctl is-active` takes several units and prints one state per line, in order.
     try:
         result = subprocess.run(
-            ["systemctl", "is-active", name],
+            ["systemctl", "is-active", *names],
             check=False,
             capture_output=True,
             text=True,
             timeout=3,
         )
     except FileNotFoundError:
-        return {"name": name, "state": "unknown", "detail": "systemctl no disponible"}
+        return [{"name": name, "state": "unknown", "detail": "systemctl no disponible"} for name in names]
     except subprocess.TimeoutExpired:
-        return {"name": name, "state": "degraded", "detail": "timeout"}
+        return [{"name": name, "state": "degraded", "detail": "timeout"} for name in names]
 
-    state = result.stdout.strip() or result.stderr.strip() or "unknown"
+    states = [line.strip() for line in result.stdout.splitlines()]
+    missing_state = result.stderr.strip() or "unknown"
+    return [
+        _systemd_service_row(name, states[index] if index < len(states) and states[index] else missing_state)
+        for index, name in enumerate(names)
+    ]
 
-    if state == "active":
-        mapped = "up"
-    elif state in {"activating", "reloading"}:
-        mapped = "degraded"
-    elif state in {"inactive", "failed", "deactivating"}:
-        mapped = "down"
-    else:
-        mapped = "unknown"
 
-    detail = SYSTEMCTL_DETAIL_LABELS.get(state, state)
-    return {"name": name, "state": mapped, "detail": detail}
+@lru_cache(maxsize=1)
+def _http_errors() -> tuple[type[Exception], ...]:
+    # Errors of the client utils.pooled_http_client picks: httpx when installed, else requests.
+    try:
+        import httpx
+    except ModuleNotFoundError:  # pragma: no cover - optional dependency fallback
+        import requests
+
+        return (requests.RequestException,)
+    return (httpx.HTTPError, httpx.InvalidURL)
 
 
 def _check_http(name: str, url: str) -> dict[str, str]:
     try:
-        response = requests.get(url, timeout=4)
+        response = utils.pooled_http_client(HTTP_POOL_SIZE).get(url, timeout=4)
         code = response.status_code
-    except requests.RequestException as exc:
+    except _http_errors() as exc:
         return {"name": name, "state": "down", "detail": f"error: {exc.__class__.__name__}"}
 
-    if code < 400:
-        state = "up"
-    elif code < 500:
-        state = "degraded"
-    else:
-        state = "down"
-
+    state = "up" if code < 400 else "degraded" if code < 500 else "down"
     return {"name": name, "state": state, "detail": f"HTTP {code}"}
 
 
+def _check_http_all(targets: list[tuple[str, str]]) -> list[dict[str, str]]:
+    if len(targets) < 2:
+        return [_check_http(name, url) for name, url in targets]
+    # Checks are network-bound, so running them together costs the slowest one, not the sum.
+    with ThreadPoolExecutor(max_workers=min(16, len(targets))) as executor:
+        return list(executor.map(lambda target: _check_http(*target), targets))
+
+
 def _apply_state_labels(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
+    # Rows may belong to the memoized cache payload; labelling is idempotent, so do it in place.
     for item in items:
         state = str(item.get("state", "unknown")).strip().lower() or "unknown"
         detail = str(item.get("detail", "")).strip()
-        detail = SYSTEMCTL_DETAIL_LABELS.get(detail, detail)
-        rows.append(
-            {
-                **item,
-                "state": state,
-                "state_label": STATE_LABELS.get(state, STATE_LABELS["unknown"]),
-                "detail": detail,
-            }
-        )
-    return rows
+        item["state"] = state
+        item["state_label"] = STATE_LABELS.get(state, STATE_LABELS["unknown"])
+        item["detail"] = SYSTEMCTL_DETAIL_LABELS.get(detail, detail)
+    return items
 
 
 def _uptime_seconds() -> float | None:
-    path = Path("/proc/uptime")
-    if not path.exists():
+    # One read instead of exists() + read_text(); float() parses the ASCII bytes directly.
+    try:
+        raw = Path("/proc/uptime").read_bytes()
+    except OSError:
         return None
 
     try:
-        raw = path.read_text(encoding="utf-8").split()[0]
-        return float(raw)
+        return float(raw.split(maxsplit=1)[0])
     except (ValueError, IndexError):
         return None
 
 
 def _cpu_temp_c() -> float | None:
-    path = Path("/sys/class/thermal/thermal_zone0/temp")
-    if not path.exists():
+    try:
+        raw = Path("/sys/class/thermal/thermal_zone0/temp").read_bytes()
+    except OSError:
         return None
 
     try:
-        milli = float(path.read_text(encoding="utf-8").strip())
+        milli = float(raw.strip())
     except ValueError:
         return None
     return milli / 1000.0
 
 
+@lru_cache(maxsize=1)
+def _read_local_metrics(_second: int) -> tuple[float | None, float | None]:
+    return _uptime_seconds(), _cpu_temp_c()
+
+
+def _local_metrics() -> tuple[float | None, float | None]:
+    # Reuse readings within the same monotonic second; call the readers directly for fresher values.
+    return _read_local_metrics(int(time.monotonic()))
+
+
+def _control_master_alive(ssh_target: str, control_path: Path) -> bool:
+    # Caller holds the control lock, so no other build is creating this socket right now.
+    if not control_path.exists():
+        return False
+    try:
+        result = subprocess.run(
+            ["ssh", "-O", "check", "-o", f"ControlPath={control_path}", ssh_target],
+            check=False,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=2,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    if result.returncode == 0:
+        return True
+    # A master that died uncleanly leaves its socket behind, and ControlMaster=no never removes it.
+    try:
+        control_path.unlink()
+    except OSError:
+        pass
+    return False
+
+
+def _start_control_master(ssh_target: str, control_path: Path, connect_timeout: int, persist_sec: int) -> bool | None:
+    # Start the master detached with no pipes: one spawned by the captured call would keep
+    # stderr open and stall subprocess.run until its timeout. None means ssh itself is missing.
+    try:
+        result = subprocess.run(
+            [
+                "ssh",
+                "-f",
+                "-N",
+                "-o",
+                "BatchMode=yes",
+                "-o",
+                f"ConnectTimeout={connect_timeout}",
+                "-o",
+                "ControlMaster=yes",
+                "-o",
+                f"ControlPersist={persist_sec}",
+                "-o",
+                f"ControlPath={control_path}",
+                ssh_target,
+            ],
+            check=False,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=max(1.0, connect_timeout + 1.0),
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    except OSError:
+        return None
+    return result.returncode == 0
+
+
+def _ssh_control_args(ssh_target: str, connect_timeout: int, persist_sec: int) -> list[str] | None:
+    # Reuse one authenticated OpenSSH connection across polls instead of a full handshake each time.
+    # None means the master could not reach the host, so the caller should not try again directly.
+    if persist_sec <= 0:
+        return []
+
+    control_dir = Path.home() / ".ssh"
+    control_path = control_dir / f"cm-{re.sub(r'[^A-Za-z0-9_.-]', '_', ssh_target)}"
+    control_args = ["-o", "ControlMaster=no", "-o", f"ControlPath={control_path}"]
+    try:
+        control_dir.mkdir(mode=0o700, exist_ok=True)
+        lock_file = control_path.with_name(f"{control_path.name}.lock").open("a")
+    except OSError:
+        return []
+
+    # Overlapping builds serialize check-and-spawn, so only one of them ever starts a master.
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if _control_master_alive(ssh_target, control_path):
+            return control_args
+        started = _start_control_master(ssh_target, control_path, connect_timeout, persist_sec)
+    if started is None:
+        return []
+    return control_args if started else None
+
+
 def _collect_remote_metrics_via_ssh(settings: dict[str, Any], cache_dir: Path) -> dict[str, Any]:
     ssh_target = str(settings.get("ssh_target", "")).strip()
     ssh_timeout_sec = float(settings.get("ssh_timeout_sec", 3) or 3)
     allow_fallback_cache = bool(settings.get("allow_fallback_cache", True))
+    control_persist_sec = int(settings.get("ssh_control_persist_sec", 600) or 0)
     remote_cache_file = cache_dir / "status_remote.json"
 
     remote_command = "cut -d. -f1 /proc/uptime; cat /sys/class/thermal/thermal_zone0/temp 2>/dev/null || true"
@@ -140,6 +304,10 @@ def _collect_remote_metrics_via_ssh(settings: dict[str, Any], cache_dir: Path) -
         if not ssh_target:
             raise ValueError("missing ssh target")
 
+        control_args = _ssh_control_args(ssh_target, int(ssh_timeout_sec), control_persist_sec)
+        if control_args is None:
+            raise RuntimeError("ssh master connection failed")
+
         result = subprocess.run(
             [
                 "ssh",
@@ -147,6 +315,7 @@ def _collect_remote_metrics_via_ssh(settings: dict[str, Any], cache_dir: Path) -
                 "BatchMode=yes",
                 "-o",
                 f"ConnectTimeout={int(ssh_timeout_sec)}",
+                *control_args,
                 ssh_target,
                 remote_command,
             ],
@@ -171,7 +340,7 @@ def _collect_remote_metrics_via_ssh(settings: dict[str, Any], cache_dir: Path) -
                 cpu_temp_c = None
 
         remote_payload = {
-            "fetched_at": datetime.now(tz=timezone.utc).isoformat(),
+            "fetched_at": utils.utc_now_iso(),
             "uptime_seconds": uptime_seconds,
             "cpu_temp_c": cpu_temp_c,
         }
@@ -199,9 +368,10 @@ def _collect_remote_metrics_via_ssh(settings: dict[str, Any], cache_dir: Path) -
                 except (TypeError, ValueError):
                     pass
 
+        uptime_seconds, cpu_temp_c = _local_metrics()
         return {
-            "uptime_seconds": _uptime_seconds(),
-            "cpu_temp_c": _cpu_temp_c(),
+            "uptime_seconds": uptime_seconds,
+            "cpu_temp_c": cpu_temp_c,
             "metrics_stale": True,
             "metrics_source": "local_fallback",
         }
@@ -211,9 +381,10 @@ def _collect_metrics(config: dict[str, Any], cache_dir: Path) -> dict[str, Any]:
     settings = _status_settings(config)
     metrics_mode = str(settings.get("metrics_mode", "local")).strip().lower()
     if metrics_mode != "remote_ssh":
+        uptime_seconds, cpu_temp_c = _local_metrics()
         return {
-            "uptime_seconds": _uptime_seconds(),
-            "cpu_temp_c": _cpu_temp_c(),
+            "uptime_seconds": uptime_seconds,
+            "cpu_temp_c": cpu_temp_c,
             "metrics_stale": False,
             "metrics_source": "local",
         }
@@ -221,21 +392,23 @@ def _collect_metrics(config: dict[str, Any], cache_dir: Path) -> dict[str, Any]:
 
 
 def _collect_status(config: dict[str, Any], cache_dir: Path) -> dict[str, Any]:
-    metrics = _collect_metrics(config, cache_dir)
-
-    services = [
-        _check_systemd_service(str(name))
-        for name in config.get("status_services", [])
-    ]
-
-    http_checks = [
-        _check_http(str(item.get("name", "http")), str(item.get("url", "")))
+    service_names = [str(name) for name in config.get("status_services", [])]
+    http_targets = [
+        (str(item.get("name", "http")), str(item.get("url", "")))
         for item in config.get("status_http_checks", [])
         if item.get("url")
     ]
 
+    # Metrics (possibly over SSH), systemd and HTTP checks are independent; wait for the slowest only.
+    metrics_future = _COLLECT_EXECUTOR.submit(_collect_metrics, config, cache_dir)
+    services_future = _COLLECT_EXECUTOR.submit(_check_systemd_services, service_names)
+    http_future = _COLLECT_EXECUTOR.submit(_check_http_all, http_targets)
+    metrics = metrics_future.result()
+    services = services_future.result()
+    http_checks = http_future.result()
+
     return {
-        "generated_at": datetime.now(tz=timezone.utc).isoformat(),
+        "generated_at": utils.utc_now_iso(),
         "services": services,
         "http_checks": http_checks,
         "uptime_seconds": metrics.get("uptime_seconds"),
@@ -252,13 +425,19 @@ def fetch_status(config: dict[str, Any], cache_dir: Path) -> tuple[dict[str, Any
     # Always attempt fresh collection when metrics come from remote SSH.
     ttl_seconds = 0 if metrics_mode == "remote_ssh" else ttl * 60
     cache_file = cache_dir / "status.json"
+    try:
+        stale_max_age_minutes = int(status_settings.get("stale_max_age_minutes", 60))
+    except (TypeError, ValueError):
+        stale_max_age_minutes = 60
 
     payload, source = utils.fetch_json_with_cache(
         cache_file,
         ttl_seconds=ttl_seconds,
         fetcher=lambda: _collect_status(config, cache_dir),
+        swr=bool(status_settings.get("stale_while_revalidate", False)),
+        max_age_seconds=max(stale_max_age_minutes, 0) * 60,
         fallback=lambda: {
-            "generated_at": datetime.now(tz=timezone.utc).isoformat(),
+            "generated_at": utils.utc_now_iso(),
             "services": [],
             "http_checks": [],
             "uptime_seconds": None,
@@ -271,7 +450,9 @@ def fetch_status(config: dict[str, Any], cache_dir: Path) -> tuple[dict[str, Any
     cpu_temp = payload.get("cpu_temp_c")
     cpu_temp_label = "n/a" if cpu_temp is None else f"{float(cpu_temp):.1f}°C"
     uptime_seconds = payload.get("uptime_seconds")
-    metrics_stale = bool(payload.get("metrics_stale", source in {"stale", "fallback"}))
+    # Cached payloads always carry metrics_stale=False from collection time, so a served-stale
+    # cache has to be flagged from the source instead.
+    metrics_stale = source in {"stale", "stale-revalidating"} or bool(payload.get("metrics_stale", source == "fallback"))
 
     summary = {
         "metrics_available": uptime_seconds is not None,
@@ -1,23 +1,85 @@
 from __future__ import annotations
 
+import importlib.util
 import json
+import os
 import re
 import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
+from functools import lru_cache
 from html import escape
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
-import yaml
-from dateutil import parser as date_parser
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency fallback
+    orjson = None
+
+if TYPE_CHECKING:
+    import httpx
+
+_SLUG_DROP_PATTERN = re.compile(r"[^a-z0-9\s-]")
+_SLUG_SEPARATOR_PATTERN = re.compile(r"[\s_-]+")
+_MD_CODE_PATTERN = re.compile(r"`{1,3}(.*?)`{1,3}", re.DOTALL)
+_MD_LINK_PATTERN = re.compile(r"\[(.*?)\]\(.*?\)")
+# Markdown markers and whitespace runs both collapse to a single space.
+_MD_MARKER_SPACE_PATTERN = re.compile(r"[#>*_~\-\s]+")
+_SPACE_BEFORE_CLOSER_PATTERN = re.compile(r"\s+([,.;:!?%\)\]\}])")
+_SPACE_AFTER_OPENER_PATTERN = re.compile(r"([\(\[\{])\s+")
+_WHITESPACE_SPLIT_PATTERN = re.compile(r"(\s+)")
+
+# Background cache refreshes for stale-while-revalidate; the executor is created on first use.
+_REFRESH_EXECUTOR: ThreadPoolExecutor | None = None
+_REFRESH_PENDING: set[Path] = set()
+_REFRESH_LOCK = threading.Lock()
+
+# Last formatted UTC timestamp and the whole second it was taken in.
+_UTC_NOW_ISO: tuple[int, str] = (-1, "")
+
+# Decoded cache files keyed by path, valid while (st_mtime_ns, st_size) is unchanged.
+_JSON_MEMO: dict[Path, tuple[int, int, Any]] = {}
 
 
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def build_http_client(max_keepalive_connections: int) -> httpx.Client | None:
+    # None without httpx, so callers keep using their requests session. Imported here so builds
+    # that never make a request don't pay for it.
+    try:
+        import httpx
+    except ModuleNotFoundError:  # pragma: no cover - optional dependency fallback
+        return None
+    # HTTP/2 needs the h2 extra (httpx[http2]); without it httpx still pools HTTP/1.1 connections.
+    return httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=max_keepalive_connections),
+    )
+
+
+@lru_cache(maxsize=None)
+def pooled_http_client(pool_size: int) -> Any:
+    # Built on first use, so builds served entirely from cache never import requests.
+    client = build_http_client(max_keepalive_connections=pool_size)
+    if client is not None:
+        return client
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+    session.mount("http://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+    return session
+
+
 def read_text(path: Path, default: str = "") -> str:
     try:
         return path.read_text(encoding="utf-8")
@@ -25,24 +87,78 @@ def read_text(path: Path, default: str = "") -> str:
         return default
 
 
+def loads_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 def read_json(path: Path, default: Any = None) -> Any:
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        return loads_json(path.read_bytes())
     except (FileNotFoundError, json.JSONDecodeError):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
         return default
 
 
+def read_json_memoized(path: Path, default: Any = None) -> Any:
+    # Callers must treat the result as shared: it is the same object on every unchanged read.
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _JSON_MEMO.pop(path, None)
+        return default
+
+    memo = _JSON_MEMO.get(path)
+    if memo is not None and memo[0] == stat.st_mtime_ns and memo[1] == stat.st_size:
+        return memo[2]
+
+    payload = read_json(path, None)
+    if payload is None:
+        return default
+    _JSON_MEMO[path] = (stat.st_mtime_ns, stat.st_size, payload)
+    return payload
+
+
 def write_json(path: Path, payload: Any) -> None:
     ensure_dir(path.parent)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, ensure_ascii=False, indent=2)
+    data = dumps_json(payload)
+
+    # Write a sibling temp file and rename it over the cache, so readers (including background
+    # refreshes) never see a torn file. The name is per thread because refreshes can overlap.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
 
 
 def load_yaml(path: Path, default: Any = None) -> Any:
+    import yaml
+
+    # Prefer the libyaml C loader when PyYAML was built with it.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
         with path.open("r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle)
+            data = yaml.load(handle, Loader=loader)
             return default if data is None else data
     except FileNotFoundError:
         return default
@@ -53,6 +169,13 @@ def load_lines(path: Path) -> list[str]:
     return [line.strip() for line in raw.splitlines() if line.strip()]
 
 
+def _mtime_or_none(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
 def is_cache_fresh(path: Path, ttl_seconds: int) -> bool:
     if ttl_seconds <= 0 or not path.exists():
         return False
@@ -60,17 +183,67 @@ def is_cache_fresh(path: Path, ttl_seconds: int) -> bool:
     return age_seconds <= ttl_seconds
 
 
+def within_stale_max_age(timestamp: float | None, max_age_seconds: int | None) -> bool:
+    # Stale-while-revalidate cap shared by every source: None serves any age, 0 never serves stale.
+    if timestamp is None:
+        return False
+    if max_age_seconds is None:
+        return True
+    return max_age_seconds > 0 and time.time() - timestamp <= max_age_seconds
+
+
+def refresh_in_background(cache_path: Path, refresh: Callable[[], Any]) -> bool:
+    # Runs refresh off the request path, at most once at a time per cache file; False if one is
+    # already pending. Errors are swallowed: the stale copy stays in place for the next call.
+    global _REFRESH_EXECUTOR
+    with _REFRESH_LOCK:
+        if cache_path in _REFRESH_PENDING:
+            return False
+        _REFRESH_PENDING.add(cache_path)
+        if _REFRESH_EXECUTOR is None:
+            _REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+    def run() -> None:
+        try:
+            refresh()
+        except Exception:
+            pass
+        finally:
+            with _REFRESH_LOCK:
+                _REFRESH_PENDING.discard(cache_path)
+
+    _REFRESH_EXECUTOR.submit(run)
+    return True
+
+
+def wait_for_background_refreshes() -> None:
+    # Call before exiting: once interpreter shutdown starts, executors used inside a refresh reject work.
+    global _REFRESH_EXECUTOR
+    with _REFRESH_LOCK:
+        executor, _REFRESH_EXECUTOR = _REFRESH_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
 def fetch_json_with_cache(
     cache_path: Path,
     ttl_seconds: int,
     fetcher: Callable[[], Any],
     fallback: Any,
+    swr: bool = False,
+    max_age_seconds: int | None = None,
 ) -> tuple[Any, str]:
-    cached = read_json(cache_path, None)
+    cached = read_json_memoized(cache_path, None)
 
     if cached is not None and is_cache_fresh(cache_path, ttl_seconds):
         return cached, "cache"
 
+    # Stale-while-revalidate: serve an expired cache (up to max_age_seconds old) and refresh it
+    # off the request path; only a missing or too-old cache blocks on the fetcher.
+    if swr and cached is not None and within_stale_max_age(_mtime_or_none(cache_path), max_age_seconds):
+        refresh_in_background(cache_path, lambda: write_json(cache_path, fetcher()))
+        return cached, "stale-revalidating"
+
     try:
         fresh = fetcher()
         write_json(cache_path, fresh)
@@ -83,6 +256,32 @@ def fetch_json_with_cache(
         return fallback, "fallback"
 
 
+@lru_cache(maxsize=4096)
+def _parse_datetime_string(value: str) -> datetime:
+    # Feed and cache timestamps repeat a lot between calls; datetimes are immutable, so share them.
+    try:
+        # Most cached values are ISO-8601; dateutil is only needed for everything else.
+        dt = datetime.fromisoformat(f"{value[:-1]}+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        # dateutil is imported on first use; ISO-only builds never load it.
+        from dateutil import parser as date_parser
+
+        dt = date_parser.parse(value)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def utc_now_iso() -> str:
+    global _UTC_NOW_ISO
+    # Timestamps taken within the same second share one formatted string.
+    now = time.time()
+    bucket = int(now)
+    if bucket != _UTC_NOW_ISO[0]:
+        _UTC_NOW_ISO = (bucket, datetime.fromtimestamp(now, tz=timezone.utc).isoformat())
+    return _UTC_NOW_ISO[1]
+
+
 def to_datetime(value: Any) -> datetime:
     if isinstance(value, datetime):
         dt = value
@@ -91,7 +290,7 @@ def to_datetime(value: Any) -> datetime:
     elif isinstance(value, (int, float)):
         dt = datetime.fromtimestamp(float(value), tz=timezone.utc)
     elif isinstance(value, str) and value.strip():
-        dt = date_parser.parse(value)
+        return _parse_datetime_string(value)
     else:
         dt = datetime.now(tz=timezone.utc)
 
@@ -110,21 +309,21 @@ def format_date(dt: datetime) -> str:
 
 def slugify(value: str) -> str:
     lowered = value.strip().lower()
-    lowered = re.sub(r"[^a-z0-9\s-]", "", lowered)
-    lowered = re.sub(r"[\s_-]+", "-", lowered)
+    lowered = _SLUG_DROP_PATTERN.sub("", lowered)
+    lowered = _SLUG_SEPARATOR_PATTERN.sub("-", lowered)
     lowered = lowered.strip("-")
     return lowered or "note"
 
 
 def excerpt_from_markdown(body: str, words: int = 45) -> str:
-    text = re.sub(r"`{1,3}(.*?)`{1,3}", r"\1", body, flags=re.DOTALL)
-    text = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", text)
-    text = re.sub(r"[#>*_~\-]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    text = re.sub(r"\s+([,.;:!?%\)\]\}])", r"\1", text)
-    text = re.sub(r"([\(\[\{])\s+", r"\1", text)
-
-    chunks = text.split(" ")
+    text = _MD_CODE_PATTERN.sub(r"\1", body)
+    text = _MD_LINK_PATTERN.sub(r"\1", text)
+    text = _MD_MARKER_SPACE_PATTERN.sub(" ", text).strip()
+    text = _SPACE_BEFORE_CLOSER_PATTERN.sub(r"\1", text)
+    text = _SPACE_AFTER_OPENER_PATTERN.sub(r"\1", text)
+
+    # Whitespace is already collapsed to single spaces; stop splitting once the excerpt is full.
+    chunks = text.split(" ", words)
     if len(chunks) <= words:
         return text
     return " ".join(chunks[:words]).strip() + "…"
@@ -155,11 +354,11 @@ class _ExcerptHTMLParser(HTMLParser):
         if self.truncated or not data:
             return
 
-        chunks = re.split(r"(\s+)", data)
+        chunks = _WHITESPACE_SPLIT_PATTERN.split(data)
         for chunk in chunks:
             if not chunk:
                 continue
-            if re.fullmatch(r"\s+", chunk):
+            if chunk.isspace():
                 if self.parts:
                     self.parts.append(chunk)
                 continue
@@ -177,8 +376,8 @@ class _ExcerptHTMLParser(HTMLParser):
             self.strong_stack -= 1
 
         text = "".join(self.parts).strip()
-        text = re.sub(r"\s+([,.;:!?%\)\]\}])", r"\1", text)
-        text = re.sub(r"([\(\[\{])\s+", r"\1", text)
+        text = _SPACE_BEFORE_CLOSER_PATTERN.sub(r"\1", text)
+        text = _SPACE_AFTER_OPENER_PATTERN.sub(r"\1", text)
         return text
 
 
@@ -194,6 +393,24 @@ def excerpt_html_from_rendered_html(rendered_html: str, words: int = 45) -> str:
 
 
 def clean_output_dir(path: Path) -> None:
+    # Drop the whole tree in one rmtree and recreate it; symlinked or mounted output dirs can't be
+    # removed, so those are still emptied child by child.
+    if path.is_dir() and not path.is_symlink() and not os.path.ismount(path):
+        gitkeep = path / ".gitkeep"
+        try:
+            gitkeep_data: bytes | None = gitkeep.read_bytes()
+        except FileNotFoundError:
+            gitkeep_data = None
+        try:
+            shutil.rmtree(path)
+        except OSError:
+            # Removing the directory itself needs write access to its parent (e.g. a deploy target
+            # owned by the build user inside /srv); whatever is left is emptied below.
+            pass
+        ensure_dir(path)
+        if gitkeep_data is not None and not gitkeep.exists():
+            gitkeep.write_bytes(gitkeep_data)
+
     ensure_dir(path)
     for child in path.iterdir():
         if child.name == ".gitkeep":
@@ -204,10 +421,64 @@ def clean_output_dir(path: Path) -> None:
             child.unlink()
 
 
+def latest_mtime(paths: list[Path]) -> float:
+    latest = 0.0
+    for path in paths:
+        try:
+            if path.is_dir():
+                for child in path.rglob("*"):
+                    latest = max(latest, child.stat().st_mtime)
+            latest = max(latest, path.stat().st_mtime)
+        except FileNotFoundError:
+            continue
+    return latest
+
+
+def is_output_fresh(path: Path, source_mtime: float) -> bool:
+    try:
+        return path.stat().st_mtime >= source_mtime
+    except FileNotFoundError:
+        return False
+
+
+def _link_or_copy(source: str, destination: str) -> str:
+    source_stat = os.stat(source)
+    try:
+        destination_stat = os.stat(destination)
+    except FileNotFoundError:
+        destination_stat = None
+    if destination_stat is not None:
+        # Same inode (an earlier hard link) or same size and mtime: nothing to copy.
+        if destination_stat.st_ino == source_stat.st_ino and destination_stat.st_dev == source_stat.st_dev:
+            return destination
+        if destination_stat.st_size == source_stat.st_size and destination_stat.st_mtime_ns == source_stat.st_mtime_ns:
+            return destination
+        os.unlink(destination)
+
+    # Hard links avoid re-reading every asset; other filesystems or link limits fall back to a copy.
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+    return destination
+
+
+def _prune_missing(source: Path, destination: Path) -> None:
+    for child in destination.iterdir():
+        counterpart = source / child.name
+        if child.is_dir():
+            if counterpart.is_dir():
+                _prune_missing(counterpart, child)
+            else:
+                shutil.rmtree(child)
+        elif not counterpart.exists() or counterpart.is_dir():
+            child.unlink()
+
+
 def copy_static_tree(source: Path, destination: Path) -> None:
     if destination.exists():
-        shutil.rmtree(destination)
-    shutil.copytree(source, destination)
+        _prune_missing(source, destination)
+    shutil.copytree(source, destination, copy_function=_link_or_copy, dirs_exist_ok=True)
 
 
 def format_uptime(seconds: float | int | None) -> str:
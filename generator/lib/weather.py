@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime, timezone
+import re
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
 
-import requests
-
 from . import utils
 
 
@@ -67,6 +66,20 @@ WEEKDAY_NAMES = [
     "Domingo",
 ]
 
+# One scan finds every icon keyword; when several match, the earlier group in this pattern wins.
+_ICON_PATTERN = re.compile(
+    r"(?P<storm>tormenta|thunderstorm)"
+    r"|(?P<drizzle>llovizna|drizzle)"
+    r"|(?P<rain>lluvia|rain|chaparr)"
+    r"|(?P<snow>nieve|snow)"
+    r"|(?P<mist>niebla|mist|fog|haze|neblina)"
+    r"|(?P<sun>despejado|soleado|clear|sun)"
+    r"|(?P<cloud>nublado|cloud|overcast)"
+)
+
+# Connections kept per provider host (httpx client or requests session, created lazily).
+HTTP_POOL_SIZE = 4
+
 
 def _to_spanish_description(value: Any) -> str:
     description = str(value or "").strip().lower()
@@ -80,21 +93,10 @@ def _icon_for_description(value: Any) -> str:
     if not description:
         return "cloud"
 
-    if any(token in description for token in ("tormenta", "thunderstorm")):
-        return "storm"
-    if any(token in description for token in ("llovizna", "drizzle")):
-        return "drizzle"
-    if any(token in description for token in ("lluvia", "rain", "chaparr")):
-        return "rain"
-    if any(token in description for token in ("nieve", "snow")):
-        return "snow"
-    if any(token in description for token in ("niebla", "mist", "fog", "haze", "neblina")):
-        return "mist"
-    if any(token in description for token in ("despejado", "soleado", "clear", "sun")):
-        return "sun"
-    if any(token in description for token in ("nublado", "cloud", "overcast")):
+    matches = {match.lastgroup for match in _ICON_PATTERN.finditer(description)}
+    if not matches:
         return "cloud"
-    return "cloud"
+    return min(matches, key=_ICON_PATTERN.groupindex.__getitem__)
 
 
 def _weather_settings(config: dict[str, Any]) -> dict[str, Any]:
@@ -165,20 +167,7 @@ def _normalize_forecast_days(entries: list[dict[str, Any]], timezone_name: str)
     return items
 
 
-def _fetch_open_meteo(site: dict[str, Any]) -> dict[str, Any]:
-    params = {
-        "latitude": site.get("latitude"),
-        "longitude": site.get("longitude"),
-        "current": "temperature_2m,relative_humidity_2m,wind_speed_10m,weather_code",
-        "daily": "weather_code,temperature_2m_max,temperature_2m_min",
-        "forecast_days": 3,
-        "timezone": site.get("timezone", "auto"),
-    }
-
-    response = requests.get("https://api.open-meteo.com/v1/forecast", params=params, timeout=6)
-    response.raise_for_status()
-
-    data = response.json()
+def _open_meteo_weather(data: dict[str, Any]) -> dict[str, Any]:
     payload = data.get("current", {})
     daily = data.get("daily", {})
     code = int(payload.get("weather_code", 0))
@@ -201,7 +190,7 @@ def _fetch_open_meteo(site: dict[str, Any]) -> dict[str, Any]:
 
     return {
         "provider": "open_meteo",
-        "updated_at": datetime.now(tz=timezone.utc).isoformat(),
+        "updated_at": utils.utc_now_iso(),
         "temp_c": float(payload.get("temperature_2m", 0.0)),
         "humidity": int(payload.get("relative_humidity_2m", 0)),
         "wind_kmh": float(payload.get("wind_speed_10m", 0.0)),
@@ -210,6 +199,33 @@ def _fetch_open_meteo(site: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _fetch_open_meteo_many(sites: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # Open-Meteo takes comma-separated coordinates, so every location costs one request in total.
+    params = {
+        "latitude": ",".join(str(site.get("latitude")) for site in sites),
+        "longitude": ",".join(str(site.get("longitude")) for site in sites),
+        "current": "temperature_2m,relative_humidity_2m,wind_speed_10m,weather_code",
+        "daily": "weather_code,temperature_2m_max,temperature_2m_min",
+        "forecast_days": 3,
+        "timezone": ",".join(str(site.get("timezone", "auto")) for site in sites),
+    }
+
+    client = utils.pooled_http_client(HTTP_POOL_SIZE)
+    response = client.get("https://api.open-meteo.com/v1/forecast", params=params, timeout=6)
+    response.raise_for_status()
+
+    data = response.json()
+    # A single location comes back as an object, several as an array in request order.
+    locations = data if isinstance(data, list) else [data]
+    if len(locations) != len(sites):
+        raise RuntimeError(f"Open-Meteo returned {len(locations)} locations for {len(sites)} sites")
+    return [_open_meteo_weather(location) for location in locations]
+
+
+def _fetch_open_meteo(site: dict[str, Any]) -> dict[str, Any]:
+    return _fetch_open_meteo_many([site])[0]
+
+
 def _fetch_weatherapi(site: dict[str, Any], settings: dict[str, Any]) -> dict[str, Any]:
     api_key_env = str(settings.get("api_key_env", "WEATHERAPI_KEY")).strip() or "WEATHERAPI_KEY"
     api_key = os.environ.get(api_key_env, "").strip()
@@ -233,14 +249,15 @@ def _fetch_weatherapi(site: dict[str, Any], settings: dict[str, Any]) -> dict[st
         "aqi": "no",
         "days": 3,
     }
-    response = requests.get("https://api.weatherapi.com/v1/forecast.json", params=params, timeout=6)
+    client = utils.pooled_http_client(HTTP_POOL_SIZE)
+    response = client.get("https://api.weatherapi.com/v1/forecast.json", params=params, timeout=6)
     response.raise_for_status()
 
     data = response.json()
     payload = data.get("current", {})
     condition = payload.get("condition", {})
     updated_at = payload.get("last_updated_epoch") or payload.get("last_updated")
-    updated_label = utils.to_datetime(updated_at).isoformat() if updated_at else datetime.now(tz=timezone.utc).isoformat()
+    updated_label = utils.to_datetime(updated_at).isoformat() if updated_at else utils.utc_now_iso()
 
     forecast_days = []
     for item in data.get("forecast", {}).get("forecastday", []):
@@ -278,7 +295,7 @@ def _fetch_from_provider(provider: str, config: dict[str, Any]) -> dict[str, Any
 
 
 def _fetch_or_cached(cache_file: Path, ttl_seconds: int, fetcher: Any) -> tuple[dict[str, Any] | None, str]:
-    cached = utils.read_json(cache_file, None)
+    cached = utils.read_json_memoized(cache_file, None)
     cache_has_forecast = isinstance(cached, dict) and isinstance(cached.get("forecast", []), list)
 
     if cached is not None and utils.is_cache_fresh(cache_file, ttl_seconds) and cache_has_forecast:
@@ -297,7 +314,7 @@ def _fetch_or_cached(cache_file: Path, ttl_seconds: int, fetcher: Any) -> tuple[
 def _fallback_weather() -> dict[str, Any]:
     return {
         "provider": "fallback",
-        "updated_at": datetime.now(tz=timezone.utc).isoformat(),
+        "updated_at": utils.utc_now_iso(),
         "temp_c": 24.0,
         "humidity": 58,
         "wind_kmh": 12.0,